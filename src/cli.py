@@ -0,0 +1,92 @@
+import os
+import pathlib
+
+import click
+
+from config import DEFAULT_IGNORE_PATTERNS
+from gitingest.ingest import ingest
+from gitingest.ingest_from_query import MAX_FILE_SIZE
+from gitingest.io_batch import map_batch
+from gitingest.parse_query import normalize_pattern
+
+
+def _write_section(item: tuple) -> str:
+    path, data = item
+    # One large buffered write per file keeps the flush count down on
+    # slow filesystems.
+    with open(path, "wb", buffering=1 << 20) as f:
+        f.write(data.encode('utf-8'))
+    return f"{os.path.basename(path)} written to {path}"
+
+
+def _do_ingest(qry: dict, rslt: tuple) -> None:
+    """Write the summary, tree and content of an ingest run to separate files."""
+    out_dir = qry['output']
+    repo = qry['repo_name']
+    os.makedirs(out_dir, exist_ok=True)
+
+    paths = [os.path.join(out_dir, f"{repo}_{kind}.txt") for kind in ("summary", "tree", "content")]
+
+    # The three writes overlap on the shared pool, so a slow (network)
+    # filesystem costs one flush latency instead of three.
+    messages = map_batch(_write_section, list(zip(paths, rslt)))
+
+    # A single echo means one stdout lock/flush instead of three.
+    click.echo("\n".join(messages))
+
+
+@click.command()
+@click.argument('source', type=str, required=True)
+@click.option('--output', '-o', default=None, help='Output file or directory (directories get one file per section)')
+@click.option('--max-size', '-s', default=MAX_FILE_SIZE, help='Maximum file size to process in bytes')
+@click.option('--exclude-pattern', '-e', multiple=True, help='Patterns to exclude')
+@click.option('--include-pattern', '-i', multiple=True, help='Patterns to include')
+@click.option('--gitignore/--no-gitignore', 'use_gitignore', default=False, help="Honor the source's .gitignore file")
+def main(source, output, max_size, exclude_pattern, include_pattern, use_gitignore):
+    """Analyze a directory or repository and create a text dump of its contents."""
+    try:
+        # Combine default and custom ignore patterns, deduping while keeping
+        # first-seen order so repeated flags don't grow the match loop.
+        ignore_patterns = list(dict.fromkeys((*DEFAULT_IGNORE_PATTERNS, *exclude_pattern)))
+
+        gitignore_path = os.path.join(source, '.gitignore')
+        if use_gitignore and os.path.isfile(gitignore_path):
+            # Read once as bytes and only decode the lines that survive the
+            # blank/comment filter; large .gitignore files parse in one pass.
+            data = pathlib.Path(gitignore_path).read_bytes()
+            lines = [ln for ln in data.split(b'\n') if ln.strip() and not ln.lstrip().startswith(b'#')]
+            ignore_patterns.extend(normalize_pattern(ln.decode('utf-8', 'replace')) for ln in lines)
+
+        include_patterns = list(set(include_pattern))
+
+        summary, tree, content = ingest(source, max_size, include_patterns, ignore_patterns,
+                                        use_gitignore=use_gitignore)
+
+        if not output:
+            output = "digest.txt"
+
+        if output.endswith('.txt'):
+            sections = [
+                f"Summary:\n{summary}\n\n".encode('utf-8'),
+                f"{tree}\n".encode('utf-8'),
+                content.encode('utf-8'),
+            ]
+            with open(output, 'wb') as f:
+                if hasattr(os, 'writev'):
+                    # Scatter-gather: submit all three sections in one syscall.
+                    os.writev(f.fileno(), sections)
+                else:
+                    f.writelines(sections)
+            click.echo(f"Analysis complete! Output written to: {output}")
+        else:
+            repo_name = source.rstrip('/').split('/')[-1] or 'digest'
+            qry = {'output': output, 'repo_name': repo_name}
+            _do_ingest(qry, (summary, tree, content))
+
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import fnmatch
+import re
+
+MAX_DISPLAY_SIZE = 300000
+TMP_BASE_PATH = "../tmp"
+DELETE_REPO_AFTER = 60 * 60  # In seconds
+
+DEFAULT_IGNORE_PATTERNS = (
+    # Python
+    '*.pyc', '*.pyo', '*.pyd', '__pycache__', '.pytest_cache', '.coverage',
+    '.tox', '.nox', '.mypy_cache', '.ruff_cache', '.hypothesis',
+    'poetry.lock', 'Pipfile.lock',
+
+    # JavaScript/Node
+    'node_modules', 'bower_components', 'package-lock.json', 'yarn.lock',
+    '.npm', '.yarn', '.pnpm-store',
+
+    # Version control
+    '.git', '.svn', '.hg', '.gitignore', '.gitattributes', '.gitmodules',
+
+    # Images and media
+    '*.svg', '*.png', '*.jpg', '*.jpeg', '*.gif', '*.ico', '*.pdf',
+    '*.mov', '*.mp4', '*.mp3', '*.wav',
+
+    # Virtual environments
+    'venv', '.venv', 'env', '.env', 'virtualenv',
+
+    # IDEs and editors
+    '.idea', '.vscode', '.vs', '*.swp', '*.swo', '*.swn',
+    '.settings', '.project', '.classpath', '*.sublime-*',
+
+    # Temporary and cache files
+    '*.log', '*.bak', '*.swp', '*.tmp', '*.temp',
+    '.cache', '.sass-cache', '.eslintcache',
+    '.DS_Store', 'Thumbs.db', 'desktop.ini',
+
+    # Build directories and artifacts
+    'build', 'dist', 'target', 'out',
+    '*.egg-info', '*.egg', '*.whl',
+    '*.so', '*.dylib', '*.dll', '*.class',
+
+    # Documentation
+    'site-packages', '.docusaurus', '.next', '.nuxt',
+
+    # Other common patterns
+    '*.min.js', '*.min.css',  # Minified files
+    '*.map',  # Source maps
+    '.terraform', '*.tfstate*',  # Terraform
+    'vendor/',  # Dependencies in various languages
+)
+
+# All default patterns combined into one alternation, compiled once at import
+# time so matching a name costs a single regex match instead of one fnmatch
+# call per pattern.
+_COMBINED_IGNORE_RE = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in DEFAULT_IGNORE_PATTERNS))
+
+
+def is_ignored(name: str) -> bool:
+    """Check a name against the default ignore patterns in a single match."""
+    return _COMBINED_IGNORE_RE.match(name) is not None
+
+
+def literal_names(patterns) -> frozenset:
+    """The patterns that are plain names (no wildcard or path syntax).
+
+    A single trailing slash — gitignore's directory marker — still counts
+    as literal: "vendor/" prunes the vendor directory by name.
+    """
+    names = (p.rstrip('/') for p in patterns)
+    return frozenset(n for n in names if n and not any(c in n for c in "*?[/"))
+
+
+# Literal entries like node_modules, .git and venv account for most ignored
+# bytes in real repositories; a set lookup on the basename lets the walker
+# prune them before any stat or pattern matching.
+IGNORED_DIRS = literal_names(DEFAULT_IGNORE_PATTERNS)
+
+
+def is_ignored_dir(name: str) -> bool:
+    return name in IGNORED_DIRS
@@ -0,0 +1,6 @@
+from .ingest_from_query import ingest_from_query
+from .clone import clone_repo
+from .parse_query import parse_query
+from .ingest import ingest, ingest_async
+
+__all__ = ["ingest_from_query", "clone_repo", "parse_query", "ingest", "ingest_async"]
\ No newline at end of file
@@ -0,0 +1,98 @@
+import asyncio
+from dataclasses import dataclass
+
+from gitingest.utils import async_timeout
+
+CLONE_TIMEOUT = 20
+
+
+@dataclass(frozen=True, slots=True)
+class CloneConfig:
+    url: str
+    local_path: str
+    commit: str | None = None
+    branch: str | None = None
+    subpath: str = "/"
+
+
+async def check_repo_exists(url: str) -> bool:
+    """Check if a repository exists at the given URL using git's own transport."""
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        "ls-remote",
+        "--exit-code",
+        url,
+        "HEAD",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    await proc.communicate()
+    return proc.returncode == 0
+
+
+# stderr fragments git emits when a remote repository cannot be reached
+_REPO_NOT_FOUND_MARKERS = (
+    "not found",
+    "does not exist",
+    "could not read from remote repository",
+    "could not resolve host",
+)
+
+
+async def run_git_command(*args: str) -> tuple[bytes, bytes]:
+    """Execute a git command asynchronously and capture its output."""
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        error_message = stderr.decode().strip()
+        lowered = error_message.lower()
+        if any(marker in lowered for marker in _REPO_NOT_FOUND_MARKERS):
+            raise ValueError("Repository not found, make sure it is public")
+        raise RuntimeError(f"Git command failed: {' '.join(args)}\nError: {error_message}")
+    return stdout, stderr
+
+
+@async_timeout(CLONE_TIMEOUT)
+async def clone_repo(config: CloneConfig) -> tuple[bytes, bytes]:
+    """Clone a repository to a local path based on the provided configuration."""
+    url: str = config.url
+    local_path: str = config.local_path
+    commit: str | None = config.commit
+    branch: str | None = config.branch
+    partial_clone: bool = config.subpath != "/"
+
+    if not url:
+        raise ValueError("The 'url' parameter is required.")
+    if not local_path:
+        raise ValueError("The 'local_path' parameter is required.")
+
+    if commit:
+        # Scenario 1: Clone and checkout a specific commit. History depth is
+        # unknown, so keep the full DAG but skip blobs until the checkout
+        # materializes the one tree we read.
+        clone_cmd = ["git", "clone", "--single-branch", "--no-tags", "--filter=blob:none", url, local_path]
+        await run_git_command(*clone_cmd)
+
+        checkout_cmd = ["git", "-C", local_path, "checkout", commit]
+        return await run_git_command(*checkout_cmd)
+
+    # Scenarios 2 and 3: shallow-clone a specific or the default branch
+    clone_cmd = ["git", "clone", "--depth=1", "--single-branch", "--no-tags"]
+    if partial_clone:
+        # Only a subpath is ingested: skip fetching blobs outside it and
+        # restrict the checkout to that subtree.
+        clone_cmd += ["--filter=blob:none", "--sparse"]
+    if branch and branch.lower() not in ("main", "master"):
+        clone_cmd += ["--branch", branch]
+    clone_cmd += [url, local_path]
+    result = await run_git_command(*clone_cmd)
+
+    if partial_clone:
+        sparse_cmd = ["git", "-C", local_path, "sparse-checkout", "set", config.subpath.lstrip("/")]
+        result = await run_git_command(*sparse_cmd)
+
+    return result
@@ -0,0 +1,245 @@
+import asyncio
+import atexit
+import concurrent.futures
+import hashlib
+import os
+import subprocess
+import tempfile
+import threading
+import uuid
+from typing import List, Optional, Tuple, Union
+
+from config import TMP_BASE_PATH
+
+from gitingest.clone import CloneConfig, clone_repo, run_git_command
+from gitingest.ingest_from_query import ingest_from_query
+from gitingest.parse_query import parse_query
+
+# Opt-in persistent repository cache (set GITINGEST_REPO_CACHE=1). Hosted
+# deployments re-ingest the same URL on every refresh; keeping a bare clone
+# per slug turns those repeat ingests into a local worktree checkout instead
+# of a full network clone.
+_REPO_CACHE_DIR = f"{TMP_BASE_PATH}/cache"
+
+
+def _use_repo_cache() -> bool:
+    return os.environ.get("GITINGEST_REPO_CACHE", "") not in ("", "0")
+
+
+_LOOPS = threading.local()
+
+
+def _run(coro):
+    """Run a coroutine to completion on a reused event loop.
+
+    asyncio.run builds, installs and tears down a fresh loop (plus asyncgen
+    shutdown) on every call — pure overhead when ingest() is called in a
+    long-lived process. The loop is cached per thread, so server threadpools
+    calling the sync ingest() concurrently each reuse their own loop instead
+    of colliding on a shared one; code already running inside a loop should
+    await ingest_async() directly.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("ingest() cannot be called from a running event loop; await ingest_async() instead")
+    loop = getattr(_LOOPS, "loop", None)
+    if loop is None:
+        loop = _LOOPS.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+
+async def _clone_via_cache(query: dict) -> None:
+    """Serve the ingest from a persistent checkout keyed by (url, revision).
+
+    A cache hit skips the clone entirely: the existing worktree is fetched
+    and reset instead. Misses go through the shared bare cache, so even a
+    new revision of a known repo reuses its objects.
+    """
+    ref = query.get('commit') or query.get('branch') or "HEAD"
+    key = hashlib.sha1(f"{query['url']}@{ref}".encode()).hexdigest()
+    # Absolute: git -C <bare> resolves a relative worktree path against the
+    # bare repo, not our cwd, which would break the hit check above it.
+    worktree = os.path.abspath(f"{_REPO_CACHE_DIR}/worktrees/{key}")
+
+    if os.path.exists(os.path.join(worktree, ".git")):
+        if query.get('commit'):
+            # A pinned commit never moves; just restore a pristine checkout.
+            await run_git_command("git", "-C", worktree, "reset", "--hard")
+        else:
+            # Fetch the ref by name and reset to the fetched tip: a plain
+            # fetch + reset --hard only resets to the current HEAD and
+            # would serve the first-cloned commit forever.
+            await run_git_command("git", "-C", worktree, "fetch", "--depth=1", "origin", ref)
+            await run_git_command("git", "-C", worktree, "reset", "--hard", "FETCH_HEAD")
+    else:
+        bare_path = f"{_REPO_CACHE_DIR}/{query['slug']}.git"
+        checkout_ref = ref
+        if not os.path.isdir(bare_path):
+            os.makedirs(_REPO_CACHE_DIR, exist_ok=True)
+            await run_git_command("git", "clone", "--bare", "--filter=blob:none", query['url'], bare_path)
+        elif not query.get('commit'):
+            # A bare clone has no remote.origin.fetch refspec, so a bare
+            # fetch would move nothing but FETCH_HEAD while worktree add
+            # attached at the stale branch tip. Fetch the wanted ref
+            # explicitly and attach the worktree to what was fetched.
+            await run_git_command("git", "-C", bare_path, "fetch", "--depth=1", "origin", ref)
+            checkout_ref = "FETCH_HEAD"
+        await run_git_command("git", "-C", bare_path, "worktree", "add", "--force", worktree, checkout_ref)
+
+    # The checkout lives inside the cache; cleanup must leave it in place.
+    query['local_path'] = worktree
+    query['ephemeral'] = False
+
+
+def _remove_with_retry(func, path: str) -> None:
+    """Apply a removal call, loosening permissions and retrying once.
+
+    Read-only entries (git pack files, checked-out modes) fail the first
+    attempt; a blind swallow would silently leak them and make every later
+    run re-pay the cleanup. One chmod+retry recovers the common cases.
+    """
+    try:
+        func(path)
+    except OSError:
+        try:
+            os.chmod(path, 0o700)
+            func(path)
+        except OSError:
+            pass
+
+
+def _rmtree_scandir(root: str) -> None:
+    """Iterative in-process tree removal.
+
+    os.walk is scandir-based and non-recursive, so deletion reuses the cached
+    DirEntry type information and survives arbitrarily deep trees without the
+    stack frame per subdirectory shutil.rmtree's recursion adds.
+    """
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        for name in filenames:
+            _remove_with_retry(os.unlink, os.path.join(dirpath, name))
+        for name in dirnames:
+            target = os.path.join(dirpath, name)
+            try:
+                os.rmdir(target)
+            except OSError:
+                # os.walk does not descend into symlinked directories; they
+                # have to be unlinked rather than rmdir'd.
+                try:
+                    os.unlink(target)
+                except OSError:
+                    _remove_with_retry(os.rmdir, target)
+    _remove_with_retry(os.rmdir, root)
+
+
+def _rm_command(path: str) -> list:
+    if os.name == "nt":
+        return ["cmd", "/c", "rd", "/s", "/q", path]
+    return ["rm", "-rf", "--", path]
+
+
+def _fast_rmtree(path: str) -> None:
+    """Delete a tree with the platform's native remover.
+
+    One fork/exec replaces the per-entry stat/unlink roundtrips shutil.rmtree
+    makes from Python, which dominates cleanup time on large clones. Falls
+    back to an iterative in-process walk if the binary is unavailable.
+    """
+    try:
+        subprocess.run(
+            _rm_command(path),
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        _rmtree_scandir(path)
+
+
+# One worker serializes deletions so a burst of ingests cannot fan out into
+# dozens of rm processes; the atexit shutdown waits for queued deletions so
+# nothing is leaked when the interpreter exits.
+_CLEANUP_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="gitingest-cleanup")
+atexit.register(_CLEANUP_POOL.shutdown, wait=True)
+
+
+def _background_rmtree(path: str) -> None:
+    """Delete a directory tree without blocking the caller.
+
+    The directory is renamed out of the way first so its name is free for the
+    next ingest immediately, then the removal runs on the cleanup worker —
+    the caller returns its result while unlinks happen off-thread.
+    """
+    stash = f"{path}.trash.{uuid.uuid4().hex}"
+    try:
+        os.rename(path, stash)
+    except OSError:
+        stash = path
+    _CLEANUP_POOL.submit(_fast_rmtree, stash)
+
+
+async def ingest_async(
+    source: str,
+    max_file_size: int = 10 * 1024 * 1024,
+    include_patterns: Optional[Union[List[str], str]] = None,
+    exclude_patterns: Optional[Union[List[str], str]] = None,
+    output: Optional[str] = None,
+    use_gitignore: bool = False,
+) -> Tuple[str, str, str]:
+    """Asynchronous ingest: lets callers gather many sources on one loop."""
+    query = None
+    try:
+        query = parse_query(source, max_file_size, False, include_patterns, exclude_patterns)
+        query['use_gitignore'] = use_gitignore
+        if query['url']:
+            if _use_repo_cache():
+                await _clone_via_cache(query)
+            else:
+                # A private mkdtemp directory per ingest: concurrent ingests
+                # of the same URL can never collide, and cleanup only ever
+                # touches this directory.
+                tmp_dir = tempfile.mkdtemp(prefix="gitingest-")
+                query['local_path'] = os.path.join(tmp_dir, query['slug'])
+                query['cleanup_path'] = tmp_dir
+                clone_config = CloneConfig(
+                    url=query['url'],
+                    local_path=query['local_path'],
+                    commit=query.get('commit'),
+                    branch=query.get('branch'),
+                    subpath=query.get('subpath', '/'),
+                )
+                await clone_repo(clone_config)
+
+        if output:
+            # Stream the dump straight into the file: the concatenated
+            # content never exists in memory and the returned content string
+            # is empty.
+            with open(output, "w", buffering=1 << 20) as f:
+                summary, tree, content = ingest_from_query(query, sink=f)
+        else:
+            summary, tree, content = ingest_from_query(query)
+
+        return summary, tree, content
+    finally:
+        # Clean up the temporary directory if it was created; the clone may
+        # have raised before the mkdtemp ran, and cached checkouts are not
+        # ephemeral — they stay warm for the next ingest.
+        if query and query.get('cleanup_path') and query.get('ephemeral', True):
+            try:
+                _background_rmtree(query['cleanup_path'])
+            except OSError:
+                pass
+
+
+def ingest(
+    source: str,
+    max_file_size: int = 10 * 1024 * 1024,
+    include_patterns: Optional[Union[List[str], str]] = None,
+    exclude_patterns: Optional[Union[List[str], str]] = None,
+    output: Optional[str] = None,
+    use_gitignore: bool = False,
+) -> Tuple[str, str, str]:
+    return _run(ingest_async(source, max_file_size, include_patterns, exclude_patterns, output, use_gitignore))
@@ -0,0 +1,698 @@
+import os
+import stat
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+import tiktoken
+
+from config import literal_names
+
+from gitingest.io_batch import map_batch
+from gitingest.pattern_cache import compile_patterns
+from gitingest.notebook_utils import process_notebook
+
+
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_DIRECTORY_DEPTH = 20  # Maximum depth of directory traversal
+MAX_FILES = 10000  # Maximum number of files to process
+MAX_TOTAL_SIZE_BYTES = 500 * 1024 * 1024  # 500MB
+
+
+# Slotted nodes instead of dicts: a 10k-file tree used to carry a dict header
+# plus per-key storage for every node; slots pack the fields into fixed
+# offsets, cutting the tree's memory several-fold and making field access a
+# C-level offset load. Files and directories carry only their own fields.
+@dataclass(slots=True)
+class FileNode:
+    name: str
+    size: int
+    path: str
+    content: Optional[str] = None
+    type: str = "file"
+
+
+@dataclass(slots=True)
+class DirNode:
+    name: str
+    path: str
+    size: int = 0
+    file_count: int = 0
+    dir_count: int = 0
+    ignore_content: bool = False
+    children: List = field(default_factory=list)
+    type: str = "directory"
+
+
+def should_include(rel_path: str, include_patterns: List[str]) -> bool:
+    patterns = tuple(include_patterns)
+    if not patterns:
+        return False
+    return compile_patterns(patterns).match(rel_path) is not None
+
+def should_exclude(rel_path: str, ignore_patterns: List[str]) -> bool:
+    patterns = tuple(p for p in ignore_patterns if p)
+    if not patterns:
+        return False
+    return compile_patterns(patterns).match(rel_path) is not None
+
+def is_safe_symlink(symlink_path: str, base_path: str, real_base: str = None) -> bool:
+    """Check if a symlink points to a location within the base directory.
+
+    `real_base` lets callers resolve the base once instead of paying a
+    realpath chain per symlink.
+    """
+    try:
+        target_path = os.path.realpath(symlink_path)
+        if real_base is None:
+            real_base = os.path.realpath(base_path)
+        # Both paths are fully resolved, so containment is a plain prefix
+        # test; commonpath would re-split and compare component lists.
+        return target_path == real_base or target_path.startswith(real_base + os.sep)
+    except OSError:
+        # If there's any error resolving the paths, consider it unsafe
+        return False
+
+# Byte values that may appear in text files: the usual control characters
+# plus everything from space upward. Built once; translate deletes these so
+# any byte left over marks the file as binary.
+_TEXT_ALLOWED = bytes([7, 8, 9, 10, 12, 13, 27]) + bytes(range(0x20, 0x100))
+
+def read_if_text(file_path: str):
+    """Read a file in a single open, returning None when it is not text.
+
+    The first 1 KiB is sniffed with the translate table before the rest is
+    read, so each text file costs one open instead of the sniff-then-reopen
+    pair, and binary blobs cost one small read.
+    """
+    try:
+        if file_path.endswith('.ipynb'):
+            return process_notebook(file_path)
+        # Unbuffered: the sniff and the bulk read are the only reads, so
+        # the BufferedReader layer would just add an extra copy per file.
+        with open(file_path, 'rb', buffering=0) as f:
+            chunk = f.read(1024)
+            if chunk.translate(None, _TEXT_ALLOWED):
+                return None
+            data = chunk + f.read()
+        return data.decode('utf-8', errors='ignore')
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
+
+def _load_file_content(file_path: str) -> str:
+    content = read_if_text(file_path)
+    return content if content is not None else "[Non-text file]"
+
+def _list_dir(path: str):
+    """Drain one scandir pass, or None when the directory is unreadable."""
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except PermissionError:
+        return None
+
+def _sort_key(child) -> tuple:
+    name = child.name
+    if child.type == "file":
+        if name.lower() == "readme.md":
+            bucket = 0
+        else:
+            bucket = 2 if name.startswith(".") else 1
+    else:
+        bucket = 4 if name.startswith(".") else 3
+    return bucket, name
+
+def sort_children(children: List) -> List:
+    """Sort children nodes with:
+    1. README.md first
+    2. Regular files (not starting with dot)
+    3. Hidden files (starting with dot)
+    4. Regular directories (not starting with dot)
+    5. Hidden directories (starting with dot)
+    All groups are sorted alphanumerically within themselves.
+
+    One keyed sort instead of five passes and four sub-sorts: each child's
+    bucket is computed exactly once, with the name as the tiebreaker.
+    """
+    return sorted(children, key=_sort_key)
+
+def scan_directory(path: str, query: dict, seen_paths: set = None, depth: int = 0, stats: Dict = None) -> Optional[DirNode]:
+    """Analyzes a directory and its contents with safety limits.
+
+    The walk drives an explicit stack instead of recursing, so deep trees
+    cost no Python call frames and the depth limit could grow without
+    recursion-limit risk. Totals, empty-directory filtering and child
+    ordering settle in one bottom-up pass once scanning finishes.
+    """
+    if seen_paths is None:
+        seen_paths = set()
+    if stats is None:
+        stats = {"total_files": 0, "total_size": 0}
+
+    ignore_patterns = query['ignore_patterns']
+    base_path = query['local_path']
+    base_len = len(base_path)
+    include_patterns = query['include_patterns']
+    ignored_dirs = query.get('ignored_dirs', frozenset())
+    # Honoring .gitignore files is opt-in, matching the CLI's
+    # --gitignore/--no-gitignore contract (off by default).
+    use_gitignore = query.get('use_gitignore', False)
+    # Prepared by parse_query; handcrafted queries fall back to fnmatch.
+    ignore_re = query.get('ignore_re')
+    ignore_suffixes = query.get('ignore_suffixes')
+    ignore_prefixes = query.get('ignore_prefixes', ())
+    include_re = query.get('include_re')
+    include_suffixes = query.get('include_suffixes')
+    include_dir_roots = query.get('include_dir_roots')
+    dir_ignore_re = query.get('dir_ignore_re')
+    dir_match_cache = query.get('_dir_match_cache')
+    # Bind the match methods once: the entry loop then calls straight into
+    # the regex engine's C code with no per-entry attribute lookups.
+    ignore_match = ignore_re.match if ignore_re is not None else None
+    include_match = include_re.match if include_re is not None else None
+    dir_ignore_match = dir_ignore_re.match if dir_ignore_re is not None else None
+    # Resolve the base once for the whole walk; is_safe_symlink reuses it.
+    real_base = query.get('_real_base')
+    if real_base is None:
+        real_base = os.path.realpath(base_path)
+        query['_real_base'] = real_base
+
+    root = DirNode(os.path.basename(path), path)
+    # Breadth-first worklist: each round lists one whole level of sibling
+    # directories concurrently on the shared I/O pool, then processes the
+    # entries serially. `order` records (node, parent) in discovery order so
+    # the post-pass can walk children before their parents, and `pruned`
+    # collects nodes the safety limits rejected after discovery. Each work
+    # item carries the directory's (device, inode) key when the discovering
+    # scandir already had it, so it is not re-stat'ed here.
+    stack = [(path, root, depth, None, ignored_dirs)]
+    order = []
+    pruned = set()
+
+    while stack:
+        level = stack
+        stack = []
+        ready = []
+        for current_path, result, current_depth, path_key, inherited_ignored in level:
+            if current_depth > MAX_DIRECTORY_DEPTH:
+                print(f"Skipping deep directory: {current_path} (max depth {MAX_DIRECTORY_DEPTH} reached)")
+                pruned.add(id(result))
+                continue
+
+            # Cycle detection by (device, inode): one stat instead of
+            # resolving the whole realpath chain per directory.
+            if path_key is None:
+                try:
+                    path_stat = os.stat(current_path)
+                except OSError:
+                    pruned.add(id(result))
+                    continue
+                path_key = (path_stat.st_dev, path_stat.st_ino)
+            if path_key in seen_paths:
+                print(f"Skipping already visited path: {current_path}")
+                pruned.add(id(result))
+                continue
+            seen_paths.add(path_key)
+            ready.append((current_path, result, current_depth, inherited_ignored))
+
+        # The whole level's getdents batches overlap in the pool; with
+        # follow_symlinks=False below, the type checks then come straight
+        # from the cached dirents, so regular entries cost at most one
+        # stat (for the file size) instead of several.
+        listings = map_batch(_list_dir, [p for p, _, _, _ in ready])
+
+        for (current_path, result, current_depth, inherited_ignored), listing in zip(ready, listings):
+            if stats["total_files"] >= MAX_FILES:
+                print(f"Skipping further processing: maximum file limit ({MAX_FILES}) reached")
+                pruned.add(id(result))
+                continue
+
+            if stats["total_size"] >= MAX_TOTAL_SIZE_BYTES:
+                print(f"Skipping further processing: maximum total size ({MAX_TOTAL_SIZE_BYTES/1024/1024:.1f}MB) reached")
+                pruned.add(id(result))
+                continue
+
+            if listing is None:
+                print(f"Permission denied: {current_path}")
+                continue
+
+            # When .gitignore handling is enabled, a .gitignore here
+            # contributes its literal names to this subtree only: enough to
+            # prune the build/, dist/-style entries such files almost always
+            # hold, via the same set lookup the defaults use, without a full
+            # per-directory pattern engine.
+            dir_ignored = inherited_ignored
+            if use_gitignore:
+                for entry in listing:
+                    if entry.name == ".gitignore":
+                        try:
+                            with open(entry.path, encoding='utf-8', errors='ignore') as f:
+                                lines = [line.strip() for line in f]
+                        except OSError:
+                            break
+                        names = literal_names(
+                            line for line in lines if line and not line.startswith(('#', '!'))
+                        )
+                        if names:
+                            dir_ignored = dir_ignored | names
+                        break
+
+            try:
+                for entry in listing:
+                    item = entry.name
+                    # Cheap set lookup first: prunes node_modules, .git, venv
+                    # and friends at any depth without a stat or pattern match.
+                    if item in dir_ignored:
+                        continue
+
+                    # Suffix patterns like *.pyc bind to the basename tail, so
+                    # they're tested before the relative path is even built;
+                    # most ignored entries never pay for the slice.
+                    if ignore_suffixes is not None and item.endswith(ignore_suffixes):
+                        continue
+
+                    item_path = entry.path
+                    # entry.path always extends base_path here, so a plain
+                    # slice replaces the full-string scan replace() used to do.
+                    rel_path = item_path[base_len:].lstrip(os.sep)
+
+                    if ignore_suffixes is not None:
+                        # Bucketed checks: prefix string tests first, the regex
+                        # only for the remaining wildcard patterns.
+                        if ignore_prefixes and rel_path.startswith(ignore_prefixes):
+                            continue
+                        if ignore_match is not None and ignore_match(rel_path):
+                            continue
+                    elif ignore_match is not None:
+                        if ignore_match(rel_path):
+                            continue
+                    elif should_exclude(rel_path, ignore_patterns):
+                        continue
+
+                    # Handle symlinks first: the plain-file and directory
+                    # branches below can then classify entries from the
+                    # dirent alone, without stat'ing any target.
+                    if entry.is_symlink():
+                        if not is_safe_symlink(item_path, base_path, real_base):
+                            print(f"Skipping symlink that points outside base directory: {item_path}")
+                            continue
+                        try:
+                            target_stat = entry.stat()  # follows the link
+                        except OSError:
+                            continue
+                        if (target_stat.st_dev, target_stat.st_ino) in seen_paths:
+                            print(f"Skipping already visited symlink target: {item_path}")
+                            continue
+
+                        if stat.S_ISREG(target_stat.st_mode):
+                            if include_patterns:
+                                if include_suffixes is not None:
+                                    included = item.endswith(include_suffixes)
+                                elif include_match is not None:
+                                    included = include_match(rel_path) is not None
+                                else:
+                                    included = should_include(rel_path, include_patterns)
+                                if not included:
+                                    result.ignore_content = True
+                                    continue
+
+                            file_size = target_stat.st_size
+                            if stats["total_size"] + file_size > MAX_TOTAL_SIZE_BYTES:
+                                print(f"Skipping file {item_path}: would exceed total size limit")
+                                continue
+
+                            stats["total_files"] += 1
+                            stats["total_size"] += file_size
+
+                            if stats["total_files"] > MAX_FILES:
+                                print(f"Maximum file limit ({MAX_FILES}) reached")
+                                break
+
+                            child = FileNode(item, file_size, item_path)
+                            result.children.append(child)
+                            result.size += file_size
+                            result.file_count += 1
+
+                        elif stat.S_ISDIR(target_stat.st_mode):
+                            # Walk through the link itself; inode-based cycle
+                            # detection makes resolving the target unnecessary.
+                            subdir = DirNode(item, item_path)
+                            result.children.append(subdir)
+                            order.append((subdir, result))
+                            stack.append((item_path, subdir, current_depth + 1,
+                                          (target_stat.st_dev, target_stat.st_ino),
+                                          dir_ignored))
+                        continue
+
+                    if entry.is_file(follow_symlinks=False):
+                        if include_patterns:
+                            # Suffix-only include sets (e.g. *.py) decide on
+                            # the basename alone; the regex covers the rest.
+                            if include_suffixes is not None:
+                                included = item.endswith(include_suffixes)
+                            elif include_match is not None:
+                                included = include_match(rel_path) is not None
+                            else:
+                                included = should_include(rel_path, include_patterns)
+                            if not included:
+                                result.ignore_content = True
+                                continue
+
+                        file_size = entry.stat(follow_symlinks=False).st_size
+                        if stats["total_size"] + file_size > MAX_TOTAL_SIZE_BYTES:
+                            print(f"Skipping file {item_path}: would exceed total size limit")
+                            continue
+
+                        stats["total_files"] += 1
+                        stats["total_size"] += file_size
+
+                        if stats["total_files"] > MAX_FILES:
+                            print(f"Maximum file limit ({MAX_FILES}) reached")
+                            break
+
+                        child = FileNode(item, file_size, item_path)
+                        result.children.append(child)
+                        result.size += file_size
+                        result.file_count += 1
+
+                    elif entry.is_dir(follow_symlinks=False):
+                        if include_dir_roots is not None:
+                            # Every include pattern is rooted in a fixed
+                            # directory: skip subtrees that neither contain
+                            # a root nor sit inside one.
+                            for root_dir in include_dir_roots:
+                                if (rel_path == root_dir
+                                        or root_dir.startswith(rel_path + os.sep)
+                                        or rel_path.startswith(root_dir + os.sep)):
+                                    break
+                            else:
+                                continue
+                        if dir_ignore_match is not None:
+                            # Whole-subtree exclusion: skip without listing,
+                            # and remember the verdict for repeat visits.
+                            skip = dir_match_cache.get(rel_path) if dir_match_cache is not None else None
+                            if skip is None:
+                                skip = dir_ignore_match(rel_path) is not None
+                                if dir_match_cache is not None:
+                                    dir_match_cache[rel_path] = skip
+                            if skip:
+                                continue
+                        subdir = DirNode(item, item_path)
+                        result.children.append(subdir)
+                        order.append((subdir, result))
+                        try:
+                            dir_stat = entry.stat(follow_symlinks=False)
+                            dir_key = (dir_stat.st_dev, dir_stat.st_ino)
+                        except OSError:
+                            dir_key = None
+                        stack.append((item_path, subdir, current_depth + 1, dir_key, dir_ignored))
+
+            except PermissionError:
+                print(f"Permission denied: {current_path}")
+
+    # Bottom-up pass: subdirectories finish after their parent was scanned,
+    # so totals roll up, pruned and empty directories drop out, and children
+    # get their final ordering in reverse discovery order.
+    for node, parent in reversed(order):
+        if id(node) in pruned or (include_patterns and node.file_count == 0):
+            parent.children.remove(node)
+            continue
+        node.children = sort_children(node.children)
+        parent.size += node.size
+        parent.file_count += node.file_count
+        parent.dir_count += 1 + node.dir_count
+
+    if id(root) in pruned:
+        return None
+
+    root.children = sort_children(root.children)
+    return root
+
+def extract_files_content(query: dict, node, max_file_size: int, files: List = None) -> List[Dict]:
+    """Collects all text files with their contents in tree order."""
+    if files is None:
+        files = []
+
+    # The caller's limit can only tighten the module-wide ceiling; before
+    # this clamp MAX_FILE_SIZE was defined but never enforced, so a huge
+    # max_file_size argument could pull gigabyte files into memory.
+    max_file_size = min(max_file_size, MAX_FILE_SIZE)
+
+    # The base prefix is sliced off once per file with lengths computed a
+    # single time up front; the explicit stack keeps preorder file order
+    # without a recursive call per node.
+    base = query['local_path']
+    base_len = len(base)
+    file_nodes = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.type == "file":
+            file_nodes.append(current)
+        elif current.type == "directory":
+            stack.extend(reversed(current.children))
+
+    # The tree carries only metadata; file bodies are read here, in one
+    # batch over the shared I/O pool, and land straight in the output
+    # records — so only files that survived filtering are ever opened and
+    # the repository's contents exist in memory exactly once.
+    to_read = [n for n in file_nodes if n.size <= max_file_size]
+    contents = iter(map_batch(_load_file_content, [n.path for n in to_read]))
+    for current in file_nodes:
+        if current.size > max_file_size:
+            content = None
+        else:
+            content = next(contents)
+            if content == "[Non-text file]":
+                continue
+
+        node_path = current.path
+        files.append({
+            "path": node_path[base_len:] if node_path.startswith(base) else node_path,
+            "content": content,
+            "size": current.size
+        })
+    return files
+
+def create_file_content_string(files: List[Dict], sink=None) -> str:
+    """Creates a formatted string of file contents with separators.
+
+    When `sink` is given, the sections are written straight to it and an
+    empty string is returned, so the concatenated dump never has to be
+    materialized in memory.
+    """
+    separator = "=" * 48 + "\n"
+
+    if sink is not None:
+        for file in files:
+            if not file['content']:
+                continue
+            sink.write(separator)
+            sink.write(f"File: {file['path']}\n")
+            sink.write(separator)
+            sink.write(f"{file['content']}\n\n")
+        return ""
+
+    # Collect parts and join once: += on a growing string is quadratic over
+    # thousands of files and doubles peak memory while it grows.
+    parts = []
+    for file in files:
+        if not file['content']:
+            continue
+        parts.append(separator)
+        parts.append(f"File: {file['path']}\n")
+        parts.append(separator)
+        parts.append(f"{file['content']}\n\n")
+
+    return "".join(parts)
+
+def create_summary_string(query: dict, nodes: DirNode, files: List[Dict]) -> str:
+    """Creates a summary string with file counts and content size."""
+    if "user_name" in query:
+        parts = [f"Repository: {query['user_name']}/{query['repo_name']}\n"]
+    else:
+        parts = [f"Repository: {query['slug']}\n"]
+    parts.append(f"Files analyzed: {nodes.file_count}\n")
+
+    if 'subpath' in query and query['subpath'] != '/':
+        parts.append(f"Subpath: {query['subpath']}\n")
+    if 'commit' in query and query['commit']:
+        parts.append(f"Commit: {query['commit']}\n")
+    elif 'branch' in query and query['branch'] != 'main' and query['branch'] != 'master' and query['branch']:
+        parts.append(f"Branch: {query['branch']}\n")
+    return "".join(parts)
+
+def _iter_tree_lines(query: dict, node, prefix: str = "", is_last: bool = True):
+    """Yields the formatted tree lines one at a time."""
+    if not node.name:
+        node.name = query['slug']
+
+    if node.name:
+        current_prefix = "└── " if is_last else "├── "
+        name = node.name + "/" if node.type == "directory" else node.name
+        yield prefix + current_prefix + name + "\n"
+    if node.type == "directory":
+        # Adjust prefix only if we added a node name
+        new_prefix = prefix + ("    " if is_last else "│   ") if node.name else prefix
+        children = node.children
+        last = len(children) - 1
+        for i, child in enumerate(children):
+            yield from _iter_tree_lines(query, child, new_prefix, i == last)
+
+def create_tree_structure(query: dict, node, prefix: str = "", is_last: bool = True) -> str:
+    """Creates a tree-like string representation of the file structure.
+
+    Rendering joins the yielded lines once instead of concatenating into a
+    growing string at every level of the recursion.
+    """
+    return "".join(_iter_tree_lines(query, node, prefix, is_last))
+
+# The BPE table is loaded once on first use and reused for every ingest.
+# Lazy rather than at import so environments without the encoding data can
+# still import the module (token counting degrades gracefully below).
+_ENCODING = None
+_ENCODING_LOCK = threading.Lock()
+
+def _get_encoding():
+    global _ENCODING
+    if _ENCODING is None:
+        # Serialized so concurrent first ingests load the table once
+        # instead of each paying the parse (or the download) in parallel.
+        with _ENCODING_LOCK:
+            if _ENCODING is None:
+                _ENCODING = tiktoken.get_encoding("cl100k_base")
+    return _ENCODING
+
+_TOKEN_CHUNK_SIZE = 1 << 20
+
+def _count_tokens(encoding, context_string: str) -> int:
+    """Counts tokens in 1 MB slices, encoding each group of slices in parallel.
+
+    encode_ordinary_batch fans the slices out over tiktoken's Rust thread
+    pool with the GIL released; grouping bounds how many token lists are
+    alive at once. Counts are estimates anyway; a token split at a slice
+    boundary is noise.
+    """
+    slices = [context_string[start:start + _TOKEN_CHUNK_SIZE]
+              for start in range(0, len(context_string), _TOKEN_CHUNK_SIZE)]
+    num_threads = os.cpu_count() or 1
+    total_tokens = 0
+    for start in range(0, len(slices), num_threads):
+        group = slices[start:start + num_threads]
+        total_tokens += sum(len(tokens) for tokens in
+                            encoding.encode_ordinary_batch(group, num_threads=num_threads))
+    return total_tokens
+
+# Above this many input characters, full BPE encoding dominates ingest time;
+# the displayed figure is an estimate either way, so huge dumps fall back to
+# the ~4-bytes-per-token average that cl100k shows on English text and code.
+_EXACT_COUNT_LIMIT = 5 * 1024 * 1024
+
+def _estimate_tokens_fast(context_string: str) -> int:
+    return len(context_string.encode('utf-8')) // 4
+
+def generate_token_string(context) -> str:
+    """Returns the formatted token count of a string, or of several.
+
+    Passing the output sections as a sequence counts them in place —
+    nothing is concatenated just to be scanned and thrown away.
+    """
+    if isinstance(context, str):
+        context = (context,)
+    formatted_tokens = ""
+    try:
+        if sum(len(part) for part in context) > _EXACT_COUNT_LIMIT:
+            total_tokens = sum(_estimate_tokens_fast(part) for part in context)
+        else:
+            encoding = _get_encoding()
+            total_tokens = sum(_count_tokens(encoding, part) for part in context)
+    except Exception as e:
+        print(e)
+        return None
+    if total_tokens > 1000000:
+        formatted_tokens = f"{total_tokens/1000000:.1f}M"
+    elif total_tokens > 1000:
+        formatted_tokens = f"{total_tokens/1000:.1f}k"
+    else:
+        formatted_tokens = f"{total_tokens}"
+    return formatted_tokens
+
+def ingest_single_file(path: str, query: dict, sink=None) -> Dict:
+    if not os.path.isfile(path):
+        raise ValueError(f"Path {path} is not a file")
+
+    file_size = os.path.getsize(path)
+    # Single open: sniff and read together instead of a text check that
+    # opens the file and a second open to read it.
+    content = read_if_text(path)
+    if content is None:
+        raise ValueError(f"File {path} is not a text file")
+    if file_size > query['max_file_size']:
+        content = "[Content ignored: file too large]"
+
+    base = query['local_path']
+    file_info = {
+        "path": path[len(base):] if path.startswith(base) else path,
+        "content": content,
+        "size": file_size
+    }
+
+    summary = (
+        f"Repository: {query['user_name']}/{query['repo_name']}\n"
+        f"File: {os.path.basename(path)}\n"
+        f"Size: {file_size:,} bytes\n"
+        f"Lines: {len(content.splitlines()):,}\n"
+    )
+
+    files_content = create_file_content_string([file_info])
+    tree = "Directory structure:\n└── " + os.path.basename(path)
+
+    formatted_tokens = generate_token_string(files_content)
+    if formatted_tokens:
+        summary += f"\nEstimated tokens: {formatted_tokens}"
+    if sink is not None:
+        sink.write(tree)
+        sink.write("\n")
+        sink.write(files_content)
+    return (summary, tree, files_content)
+
+def ingest_directory(path: str, query: dict, sink=None) -> Dict:
+    nodes = scan_directory(path, query)
+    files = extract_files_content(query, nodes, query['max_file_size'])
+    summary = create_summary_string(query, nodes, files)
+    tree = "Directory structure:\n" + create_tree_structure(query, nodes)
+
+    if sink is not None:
+        # Stream the dump instead of returning it. The contents are already
+        # materialized in `files`, so the token estimate counts them in
+        # place — only the concatenated dump string is avoided.
+        formatted_tokens = generate_token_string(
+            (tree, *(f['content'] for f in files if f['content'])))
+        if formatted_tokens:
+            summary += f"\nEstimated tokens: {formatted_tokens}"
+        sink.write(tree)
+        sink.write("\n")
+        create_file_content_string(files, sink)
+        return (summary, tree, "")
+
+    files_content = create_file_content_string(files)
+
+    formatted_tokens = generate_token_string((tree, files_content))
+    if formatted_tokens:
+        summary += f"\nEstimated tokens: {formatted_tokens}"
+    return (summary, tree, files_content)
+
+def ingest_from_query(query: dict, sink=None) -> Dict:
+    """Main entry point for analyzing a codebase directory or single file.
+
+    With `sink` set, the tree and file contents are written to it as they
+    are rendered and the returned content string is empty.
+    """
+    path = f"{query['local_path']}{query['subpath']}"
+    if not os.path.exists(path):
+        raise ValueError(f"{query['slug']} cannot be found")
+
+    if query.get('type') == 'blob':
+        return ingest_single_file(path, query, sink)
+    else:
+        return ingest_directory(path, query, sink)
+
@@ -0,0 +1,49 @@
+import concurrent.futures
+import os
+import threading
+from typing import Callable, List
+
+# Reading a repository means thousands of small open/read/close cycles; doing
+# them strictly one at a time leaves the process idle on I/O latency. A shared
+# thread pool lets the kernel service a whole batch of reads concurrently:
+# page-cache hits return immediately while cold reads overlap. Workers scale
+# with the machine — reads release the GIL, so oversubscribing cores pays off
+# on I/O-bound batches — capped to keep descriptor use bounded.
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Double-checked so concurrent first calls share one pool instead
+        # of racing to create (and leak) several.
+        with _executor_lock:
+            if _executor is None:
+                _executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=_MAX_WORKERS,
+                    thread_name_prefix="gitingest-io",
+                )
+    return _executor
+
+
+def _read(path: str) -> bytes:
+    # One whole-file read: skipping the BufferedReader saves a copy.
+    with open(path, 'rb', buffering=0) as f:
+        return f.read()
+
+
+def read_files(paths: List[str]) -> List[bytes]:
+    """Read many files concurrently, preserving input order."""
+    if len(paths) <= 1:
+        return [_read(p) for p in paths]
+    return list(_get_executor().map(_read, paths))
+
+
+def map_batch(func: Callable, items: List) -> List:
+    """Apply `func` to every item on the shared pool, preserving order."""
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    return list(_get_executor().map(func, items))
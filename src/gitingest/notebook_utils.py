@@ -0,0 +1,30 @@
+import json
+
+
+def process_notebook(file_path: str) -> str:
+    """Convert a Jupyter notebook file into a script-like text representation."""
+    with open(file_path, encoding='utf-8') as f:
+        notebook = json.load(f)
+
+    cells = notebook.get("cells", [])
+
+    result = []
+    for cell in cells:
+        cell_type = cell.get("cell_type")
+        if cell_type not in ("markdown", "code", "raw"):
+            raise ValueError(f"Unknown cell type: {cell_type}")
+
+        # nbformat stores source as a list of lines, but some producers emit
+        # a plain string; use it as-is rather than joining per cell.
+        source = cell.get("source", "")
+        str_ = source if isinstance(source, str) else "".join(source)
+        if not str_:
+            continue
+
+        # Wrap non-code cells in triple quotes so the output stays valid Python
+        if cell_type in ("markdown", "raw"):
+            str_ = f'"""\n{str_}\n"""'
+
+        result.append(str_)
+
+    return "\n\n".join(result)
@@ -0,0 +1,216 @@
+import functools
+import os
+import re
+import uuid
+from typing import List, Union
+
+from config import DEFAULT_IGNORE_PATTERNS, literal_names
+
+from gitingest.pattern_cache import compile_patterns
+
+_COMMIT_HASH_RE = re.compile(r"[0-9a-fA-F]{40}\Z")
+
+# Sources that should be parsed as repository URLs rather than local paths.
+# startswith on a tuple is one C-level check that short-circuits, instead of
+# scanning the whole string for a substring.
+_URL_PREFIXES = ("http://", "https://", "github.com/", "www.github.com/", "git@")
+
+
+def _is_valid_git_commit_hash(commit: str) -> bool:
+    # The {40} quantifier covers the length check, so one C-level match
+    # replaces the per-character membership loop.
+    return _COMMIT_HASH_RE.fullmatch(commit) is not None
+
+
+# \w covers the alphanumerics (and underscore) the old per-character loop
+# accepted; * rather than + so an empty segment stays valid, as before.
+_VALID_PATTERN_RE = re.compile(r"[\w./+\-*]*")
+
+
+def _is_valid_pattern(pattern: str) -> bool:
+    # One C-level scan instead of a Python generator over every character.
+    return _VALID_PATTERN_RE.fullmatch(pattern) is not None
+
+
+def parse_url(url: str) -> dict:
+    parsed = {
+        "user_name": None,
+        "repo_name": None,
+        "type": None,
+        "branch": None,
+        "commit": None,
+        "subpath": "/",
+        "local_path": None,
+        "url": None,
+        "slug": None,
+        "id": None,
+    }
+
+    url = url.split(" ")[0]
+    if not url.startswith('https://'):
+        url = 'https://' + url
+
+    # Extract domain and path
+    url_parts = url.split('/')
+    domain = url_parts[2]
+    path_parts = url_parts[3:]
+
+    if len(path_parts) < 2:
+        raise ValueError("Invalid repository URL. Please provide a valid Git repository URL.")
+
+    parsed["user_name"] = path_parts[0]
+    parsed["repo_name"] = path_parts[1]
+
+    # Keep original URL format
+    parsed["url"] = f"https://{domain}/{parsed['user_name']}/{parsed['repo_name']}"
+    parsed['slug'] = f"{parsed['user_name']}-{parsed['repo_name']}"
+    parsed["id"] = str(uuid.uuid4())
+    # local_path is assigned when the clone actually happens (ingest_async):
+    # creating a directory at parse time would leak one for every caller
+    # that never clones — parse-only use, and cache-served ingests.
+
+    if len(path_parts) > 3:
+        parsed["type"] = path_parts[2]
+        parsed["branch"] = path_parts[3]
+        if _is_valid_git_commit_hash(parsed['branch']):
+            parsed["commit"] = parsed['branch']
+
+        parsed["subpath"] = "/" + "/".join(path_parts[4:])
+    return parsed
+
+
+def normalize_pattern(pattern: str) -> str:
+    pattern = pattern.strip()
+    pattern = pattern.lstrip(os.sep)
+    if pattern.endswith(os.sep):
+        pattern += "*"
+    return pattern
+
+
+def parse_patterns(pattern: Union[List[str], str]) -> tuple:
+    if isinstance(pattern, list):
+        pattern = tuple(pattern)
+    return _parse_patterns_cached(pattern)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_patterns_cached(pattern: Union[tuple, str]) -> tuple:
+    # Validating and normalizing a pattern spec is pure, so a long-running
+    # process (server mode) pays the split/validate cost once per unique spec.
+    if isinstance(pattern, tuple):
+        pattern = ",".join(pattern)
+
+    for p in pattern.split(","):
+        if not _is_valid_pattern(p.strip()):
+            raise ValueError(
+                f"Pattern '{p}' contains invalid characters. Only alphanumeric characters, dash (-), "
+                "underscore (_), dot (.), forward slash (/), plus (+), and asterisk (*) are allowed."
+            )
+    return tuple(normalize_pattern(p) for p in pattern.split(","))
+
+
+def override_ignore_patterns(ignore_patterns, include_patterns) -> tuple:
+    include = set(include_patterns)
+    return tuple(p for p in ignore_patterns if p not in include)
+
+
+def parse_path(path: str) -> dict:
+
+    query = {
+        "local_path": os.path.abspath(path),
+        "slug": os.path.basename(os.path.dirname(path)) + "/" + os.path.basename(path),
+        "subpath": "/",
+        "id": str(uuid.uuid4()),
+        "url": None,
+    }
+    return query
+
+
+def parse_query(source: str, max_file_size: int, from_web: bool, include_patterns: Union[List[str], str] = None, ignore_patterns: Union[List[str], str] = None) -> dict:
+    if from_web:
+        query = parse_url(source)
+    else:
+        if source.startswith(_URL_PREFIXES):
+            query = parse_url(source)
+        else:
+            query = parse_path(source)
+    query['max_file_size'] = max_file_size
+
+    # Tuples throughout: pattern sets are hashable, so the compiled-regex
+    # cache keys on them directly with no per-call conversion.
+    if ignore_patterns and ignore_patterns != "":
+        ignore_patterns = tuple(dict.fromkeys((*DEFAULT_IGNORE_PATTERNS, *parse_patterns(ignore_patterns))))
+    else:
+        ignore_patterns = DEFAULT_IGNORE_PATTERNS
+
+    if include_patterns and include_patterns != "":
+        include_patterns = parse_patterns(include_patterns)
+        ignore_patterns = override_ignore_patterns(ignore_patterns, include_patterns)
+    else:
+        include_patterns = None
+
+    query['ignore_patterns'] = ignore_patterns
+    query['include_patterns'] = include_patterns
+    # Plain names get O(1) rejection in the walker before any pattern match.
+    query['ignored_dirs'] = literal_names(ignore_patterns)
+    # One compiled alternation per pattern set: the walker pays a single
+    # regex match per path instead of one fnmatch call per pattern.
+    # Bucket the ignore patterns: plain names already live in ignored_dirs,
+    # "*.ext" becomes a suffix check and "name*" a prefix check — both plain
+    # C-level string operations — leaving only genuinely wildcarded patterns
+    # for the compiled regex.
+    suffixes, prefixes, general = [], [], []
+    for p in ignore_patterns:
+        if not p or p.rstrip('/') in query['ignored_dirs']:
+            continue
+        if p.startswith('*.') and not any(c in p[1:] for c in "*?[/"):
+            suffixes.append(p[1:])
+        elif p.endswith('*') and not any(c in p[:-1] for c in "*?[/"):
+            prefixes.append(p[:-1])
+        else:
+            general.append(p)
+    query['ignore_suffixes'] = tuple(suffixes)
+    query['ignore_prefixes'] = tuple(prefixes)
+    query['ignore_re'] = compile_patterns(tuple(general)) if general else None
+    query['include_re'] = compile_patterns(tuple(include_patterns)) if include_patterns else None
+    # When every include pattern is a plain *.ext, inclusion reduces to one
+    # endswith on the basename — no relative path, no regex.
+    include_suffixes = None
+    if include_patterns:
+        suffix_only = [p[1:] for p in include_patterns
+                       if p.startswith('*.') and not any(c in p[1:] for c in "*?[/")]
+        if len(suffix_only) == len(include_patterns):
+            include_suffixes = tuple(suffix_only)
+    query['include_suffixes'] = include_suffixes
+    # Include patterns rooted in a fixed directory (src/*, docs/api/*.md)
+    # let the walker skip every subtree that cannot contain a match. Any
+    # pattern without a fixed root (*.py) can match anywhere, which
+    # disables the pruning entirely.
+    include_dir_roots = None
+    if include_patterns:
+        roots = []
+        for p in include_patterns:
+            magic = [i for i in (p.find(c) for c in "*?[") if i != -1]
+            prefix = p[:min(magic)] if magic else p
+            root = prefix.rpartition('/')[0]
+            if not root:
+                roots = None
+                break
+            roots.append(root)
+        if roots:
+            include_dir_roots = tuple(roots)
+    query['include_dir_roots'] = include_dir_roots
+
+    # Patterns like "dir/*" exclude everything below a directory, so the
+    # walker can skip those subtrees without even listing them. Results are
+    # memoized per relative directory in _dir_match_cache.
+    dir_prefixes = []
+    for p in ignore_patterns:
+        if p.endswith('/**'):
+            dir_prefixes.append(p[:-3])
+        elif p.endswith('/*'):
+            dir_prefixes.append(p[:-2])
+    query['dir_ignore_re'] = compile_patterns(tuple(dir_prefixes)) if dir_prefixes else None
+    query['_dir_match_cache'] = {}
+
+    return query
@@ -0,0 +1,31 @@
+import fnmatch
+import functools
+import re
+
+# google-re2 guarantees linear-time matching, which matters once users feed
+# in thousands of ignore patterns: the alternation stays O(path length)
+# instead of risking backtracking blowups. It is optional — the stdlib
+# engine handles the typical few dozen patterns just fine.
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_patterns(patterns: tuple):
+    """Compile a tuple of fnmatch patterns into a single alternation regex.
+
+    The cache means a long-running process (server mode, repeated CLI runs)
+    compiles each unique pattern set exactly once; every later query with
+    the same patterns reuses the compiled regex. When the optional re2
+    binding is installed the alternation is compiled there for guaranteed
+    linear-time matching; patterns re2 cannot express fall back to re.
+    """
+    joined = "|".join(f"(?:{fnmatch.translate(p)})" for p in patterns)
+    if _re2 is not None:
+        try:
+            return _re2.compile(joined)
+        except _re2.error:
+            pass
+    return re.compile(joined)
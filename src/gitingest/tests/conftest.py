@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Add the src directory to PYTHONPATH so tests can use the package layout
+src_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, src_dir)
@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from gitingest.clone import CloneConfig, check_repo_exists, clone_repo
+
+
+@pytest.mark.asyncio
+async def test_clone_repo_with_commit():
+    clone_config = CloneConfig(
+        url='https://github.com/user/repo',
+        local_path='/tmp/repo',
+        commit='a' * 40,  # Simulating a valid commit hash
+        branch='main',
+    )
+
+    with patch('gitingest.clone.run_git_command', new_callable=AsyncMock) as mock_exec:
+        await clone_repo(clone_config)
+        assert mock_exec.call_count == 2  # Clone and checkout calls
+
+
+@pytest.mark.asyncio
+async def test_clone_repo_without_commit():
+    clone_config = CloneConfig(
+        url='https://github.com/user/repo',
+        local_path='/tmp/repo',
+        commit=None,
+        branch='main',
+    )
+
+    with patch('gitingest.clone.run_git_command', new_callable=AsyncMock) as mock_exec:
+        await clone_repo(clone_config)
+        assert mock_exec.call_count == 1  # Only clone call
+
+
+@pytest.mark.asyncio
+async def test_clone_repo_with_subpath():
+    clone_config = CloneConfig(
+        url='https://github.com/user/repo',
+        local_path='/tmp/repo',
+        commit=None,
+        branch='main',
+        subpath='/src/docs',
+    )
+
+    with patch('gitingest.clone.run_git_command', new_callable=AsyncMock) as mock_exec:
+        await clone_repo(clone_config)
+        assert mock_exec.call_count == 2  # Partial clone and sparse-checkout calls
+        clone_args = mock_exec.call_args_list[0].args
+        assert '--filter=blob:none' in clone_args
+        assert '--sparse' in clone_args
+        sparse_args = mock_exec.call_args_list[1].args
+        assert sparse_args[-2:] == ('set', 'src/docs')
+
+
+@pytest.mark.asyncio
+async def test_clone_repo_nonexistent_repository():
+    clone_config = CloneConfig(
+        url='https://github.com/user/nonexistent-repo',
+        local_path='/tmp/repo',
+        commit=None,
+        branch='main',
+    )
+
+    with patch('asyncio.create_subprocess_exec', new_callable=AsyncMock) as mock_exec:
+        mock_process = AsyncMock()
+        mock_process.returncode = 128
+        mock_process.communicate.return_value = (
+            b'',
+            b"fatal: repository 'https://github.com/user/nonexistent-repo/' not found",
+        )
+        mock_exec.return_value = mock_process
+
+        with pytest.raises(ValueError, match="Repository not found"):
+            await clone_repo(clone_config)
+
+
+@pytest.mark.asyncio
+async def test_check_repo_exists():
+    url = "https://github.com/user/repo"
+
+    with patch('asyncio.create_subprocess_exec', new_callable=AsyncMock) as mock_exec:
+        mock_process = AsyncMock()
+        mock_process.communicate.return_value = (b'', b'')
+        mock_exec.return_value = mock_process
+
+        # Test existing repository
+        mock_process.returncode = 0
+        assert await check_repo_exists(url) is True
+
+        # Test non-existing repository
+        mock_process.returncode = 2
+        assert await check_repo_exists(url) is False
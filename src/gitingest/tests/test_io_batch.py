@@ -0,0 +1,20 @@
+from gitingest.io_batch import map_batch, read_files
+
+
+def test_read_files_preserves_order(tmp_path):
+    paths = []
+    for i in range(10):
+        p = tmp_path / f"file{i}.txt"
+        p.write_bytes(f"content {i}".encode())
+        paths.append(str(p))
+
+    contents = read_files(paths)
+    assert contents == [f"content {i}".encode() for i in range(10)]
+
+
+def test_read_files_empty_batch():
+    assert read_files([]) == []
+
+
+def test_map_batch_preserves_order():
+    assert map_batch(lambda x: x * 2, [1, 2, 3]) == [2, 4, 6]